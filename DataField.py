@@ -1,6 +1,8 @@
 from typing import Any, List, Optional
 
 class DataField:
+    __slots__ = ("name", "field_type", "description", "section")
+
     def __init__(self, name: str, field_type: str, description: Optional[str] = None, section: Optional[str] = None):
         self.name = name
         self.field_type = field_type
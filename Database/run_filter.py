@@ -5,6 +5,8 @@ Simple script to run SQL filter queries on the database.
 import sqlite3
 import os
 import argparse
+import csv
+import io
 
 
 def load_sql_file(filepath):
@@ -113,9 +115,11 @@ def main():
                 output_content = f"\n{header}\n{separator}\n" + "\n".join(rows) + f"\n\n({len(results)} row{'s' if len(results) != 1 else ''} returned)"
         
         elif args.output == 'csv':
-            output_content = ",".join(columns) + "\n"
-            for row in results:
-                output_content += ",".join(str(val) if val is not None else '' for val in row) + "\n"
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(columns)
+            writer.writerows(results)
+            output_content = buffer.getvalue()
         
         elif args.output == 'json':
             import json
@@ -2,6 +2,7 @@ import argparse
 import json
 import math
 import re
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
@@ -10,6 +11,15 @@ import matplotlib.pyplot as plt
 import networkx as nx
 
 
+# SQL parsing patterns, compiled once at import. SQL identifiers and
+# keywords are ASCII, so \w/\s/\b use the cheaper ASCII tables.
+_WHERE_CLAUSE_RE = re.compile(r'WHERE\s+(.*?)(?=;|$)', re.IGNORECASE | re.DOTALL | re.ASCII)
+_COMPARISON_RE = re.compile(r'(\w+)\s*([><=!]+)\s*([^,\s]+)', re.IGNORECASE | re.ASCII)
+_IN_CONDITION_RE = re.compile(r'(\w+)\s+IN\s*\(([^)]+)\)', re.IGNORECASE | re.ASCII)
+_EQUALS_RE = re.compile(r'(\w+)\s*=\s*([^,\s]+)', re.IGNORECASE | re.ASCII)
+_QUOTED_VALUE_RE = re.compile(r"'([^']+)'")
+
+
 @dataclass
 class PolicyCondition:
     """Represents a single condition from the SQL policy."""
@@ -66,7 +76,7 @@ class PolicyRuleKGGenerator:
     def _parse_sql_conditions(self, sql_text: str) -> None:
         """Parse SQL WHERE clause to extract individual conditions."""
         # Extract WHERE clause
-        where_match = re.search(r'WHERE\s+(.*?)(?=;|$)', sql_text, re.IGNORECASE | re.DOTALL)
+        where_match = _WHERE_CLAUSE_RE.search(sql_text)
         if not where_match:
             return
         
@@ -97,6 +107,11 @@ class PolicyRuleKGGenerator:
         string_delim = ""
         start = 0
         
+        # Fold the operator once; only slice and compare at plausible start chars
+        op_upper = operator.upper()
+        op_len = len(operator)
+        op_first = {op_upper[0], op_upper[0].lower()}
+        
         i = 0
         while i < len(text):
             char = text[i]
@@ -118,16 +133,16 @@ class PolicyRuleKGGenerator:
             elif char == ')':
                 depth = max(depth - 1, 0)
             
-            if depth == 0 and text[i:i+len(operator)].upper() == operator.upper():
+            if depth == 0 and char in op_first and text[i:i+op_len].upper() == op_upper:
                 # Check word boundaries
                 before = text[i-1] if i > 0 else ' '
-                after = text[i+len(operator)] if i+len(operator) < len(text) else ' '
+                after = text[i+op_len] if i+op_len < len(text) else ' '
                 
                 if self._is_word_boundary(before) and self._is_word_boundary(after):
                     part = text[start:i].strip()
                     if part:
                         parts.append(part)
-                    i += len(operator)
+                    i += op_len
                     start = i
                     continue
             
@@ -159,13 +174,13 @@ class PolicyRuleKGGenerator:
         # Pattern matching for different condition types
         patterns = [
             # Field comparison patterns
-            (r'(\w+)\s*([><=!]+)\s*([^,\s]+)', self._parse_comparison),
-            (r'(\w+)\s+IN\s*\(([^)]+)\)', self._parse_in_condition),
-            (r'(\w+)\s*=\s*([^,\s]+)', self._parse_equals),
+            (_COMPARISON_RE, self._parse_comparison),
+            (_IN_CONDITION_RE, self._parse_in_condition),
+            (_EQUALS_RE, self._parse_equals),
         ]
         
         for pattern, parser in patterns:
-            match = re.search(pattern, condition, re.IGNORECASE)
+            match = pattern.search(condition)
             if match:
                 return parser(match, condition)
         
@@ -185,7 +200,7 @@ class PolicyRuleKGGenerator:
         values_str = match.group(2)
         
         # Extract values from the IN clause
-        values = re.findall(r"'([^']+)'", values_str)
+        values = _QUOTED_VALUE_RE.findall(values_str)
         value = ', '.join(values) if values else values_str
         
         return self._create_condition(field_name, 'IN', value, full_condition)
@@ -238,20 +253,18 @@ class PolicyRuleKGGenerator:
         """Build the knowledge graph with policy as center node."""
         # Create policy center node
         policy_id = "policy_center"
-        self.graph.add_node(
-            policy_id,
-            id=policy_id,
-            type="Policy",
-            label="Bariatric Surgery Policy",
-            description="Policy rules for bariatric surgery eligibility",
-            node_size=2000
-        )
+        nodes_to_add = [(policy_id, {
+            "id": policy_id,
+            "type": "Policy",
+            "label": "Bariatric Surgery Policy",
+            "description": "Policy rules for bariatric surgery eligibility",
+            "node_size": 2000
+        })]
+        edges_to_add = []
         
         # Group conditions by type
-        condition_groups = {}
+        condition_groups = defaultdict(list)
         for condition in self.conditions:
-            if condition.condition_type not in condition_groups:
-                condition_groups[condition.condition_type] = []
             condition_groups[condition.condition_type].append(condition)
         
         # Create group nodes and condition nodes
@@ -265,21 +278,19 @@ class PolicyRuleKGGenerator:
             group_x = 3 * math.cos(group_angle)
             group_y = 3 * math.sin(group_angle)
             
-            self.graph.add_node(
-                group_id,
-                id=group_id,
-                type="ConditionGroup",
-                label=f"{condition_type.title()} Conditions",
-                condition_type=condition_type,
-                node_size=1500
-            )
+            nodes_to_add.append((group_id, {
+                "id": group_id,
+                "type": "ConditionGroup",
+                "label": f"{condition_type.title()} Conditions",
+                "condition_type": condition_type,
+                "node_size": 1500
+            }))
             
             # Connect group to policy
-            self.graph.add_edge(
-                policy_id, group_id,
-                relation="contains",
-                edge_type="policy_rule"
-            )
+            edges_to_add.append((policy_id, group_id, {
+                "relation": "contains",
+                "edge_type": "policy_rule"
+            }))
             
             # Create individual condition nodes
             condition_angle_step = angle_step / len(conditions)
@@ -294,26 +305,28 @@ class PolicyRuleKGGenerator:
                 if len(condition_label) > 30:
                     condition_label = condition_label[:27] + "..."
                 
-                self.graph.add_node(
-                    condition_id,
-                    id=condition_id,
-                    type="Condition",
-                    label=condition_label,
-                    field_name=condition.field_name,
-                    operator=condition.operator,
-                    value=condition.value,
-                    description=condition.description,
-                    section=condition.section,
-                    condition_type=condition.condition_type,
-                    node_size=1000
-                )
+                nodes_to_add.append((condition_id, {
+                    "id": condition_id,
+                    "type": "Condition",
+                    "label": condition_label,
+                    "field_name": condition.field_name,
+                    "operator": condition.operator,
+                    "value": condition.value,
+                    "description": condition.description,
+                    "section": condition.section,
+                    "condition_type": condition.condition_type,
+                    "node_size": 1000
+                }))
                 
                 # Connect condition to group
-                self.graph.add_edge(
-                    group_id, condition_id,
-                    relation="contains",
-                    edge_type="group_condition"
-                )
+                edges_to_add.append((group_id, condition_id, {
+                    "relation": "contains",
+                    "edge_type": "group_condition"
+                }))
+        
+        # Add everything in one pass, preserving insertion order
+        self.graph.add_nodes_from(nodes_to_add)
+        self.graph.add_edges_from(edges_to_add)
     
     def plot(self, output_path: Optional[str] = None, show: bool = False) -> Optional[Path]:
         """Plot the knowledge graph."""
@@ -333,10 +346,10 @@ class PolicyRuleKGGenerator:
         # Get node colors and sizes
         node_colors = []
         node_sizes = []
-        for node in self.graph.nodes():
-            node_type = self.graph.nodes[node].get('type', 'Condition')
+        for _, node_data in self.graph.nodes(data=True):
+            node_type = node_data.get('type', 'Condition')
             node_colors.append(colors.get(node_type, "#95A5A6"))
-            node_sizes.append(self.graph.nodes[node].get('node_size', 1000))
+            node_sizes.append(node_data.get('node_size', 1000))
         
         # Create the plot
         plt.figure(figsize=(16, 12))
@@ -15,15 +15,11 @@ import json
 import argparse
 import sys
 import os
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple
 import networkx as nx
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -44,6 +40,7 @@ class PatientKGVisualizer:
         self.node_sizes = {}
         self.node_labels = {}
         self.edge_labels = {}
+        self.structure_type = None  # cached result of detect_data_structure()
         
         # Color schemes for different node types
         self.color_schemes = {
@@ -64,6 +61,12 @@ class PatientKGVisualizer:
         Returns:
             String indicating the detected data structure type
         """
+        if self.structure_type is None:
+            self.structure_type = self._classify_json_data()
+        return self.structure_type
+    
+    def _classify_json_data(self) -> str:
+        """Classify self.json_data by inspecting its keys and items."""
         if isinstance(self.json_data, dict):
             # Check for common patterns
             if 'patient_id' in self.json_data:
@@ -216,6 +219,13 @@ class PatientKGVisualizer:
     
     def create_object_list_graph(self) -> None:
         """Create graph from list of objects."""
+        # Index objects by id/name so relationship lookups are O(1)
+        refs: Dict[str, List[int]] = {}
+        for idx, obj in enumerate(self.json_data):
+            for ref in (obj.get('id'), obj.get('name')):
+                if isinstance(ref, str) and idx not in refs.get(ref, ()):
+                    refs.setdefault(ref, []).append(idx)
+        
         for idx, obj in enumerate(self.json_data):
             obj_id = f"obj_{idx}"
             obj_type = obj.get('type', 'object')
@@ -227,9 +237,9 @@ class PatientKGVisualizer:
             
             # Try to find relationships
             for key, value in obj.items():
-                if isinstance(value, str) and any(other_obj.get('id') == value or other_obj.get('name') == value 
-                                                for other_obj in self.json_data if other_obj != obj):
-                    target_id = f"obj_{next(i for i, o in enumerate(self.json_data) if o.get('id') == value or o.get('name') == value)}"
+                matches = refs.get(value) if isinstance(value, str) else None
+                if matches and any(self.json_data[i] != obj for i in matches):
+                    target_id = f"obj_{matches[0]}"
                     self.graph.add_edge(obj_id, target_id, relation=key)
                     self.edge_labels[(obj_id, target_id)] = key
     
@@ -317,9 +327,10 @@ class PatientKGVisualizer:
         plt.axis('off')
         
         # Create legend
+        present_types = {node_type for _, node_type in self.graph.nodes(data='type')}
         legend_elements = []
         for node_type, color in self.color_schemes.items():
-            if any(self.graph.nodes[node].get('type') == node_type for node in self.graph.nodes()):
+            if node_type in present_types:
                 legend_elements.append(mpatches.Patch(color=color, label=node_type.title()))
         
         if legend_elements:
@@ -353,6 +364,9 @@ class PatientKGVisualizer:
     
     def create_plotly_visualization(self, layout: str = 'spring', output_file: Optional[str] = None, input_file_path: Optional[str] = None) -> None:
         """Create an interactive Plotly visualization of the knowledge graph."""
+        # Imported here so the default matplotlib path doesn't pay for plotly
+        import plotly.graph_objects as go
+        
         # Choose layout
         if layout == 'spring':
             pos = nx.spring_layout(self.graph, k=3, iterations=50)
@@ -366,14 +380,13 @@ class PatientKGVisualizer:
         edge_y = []
         edge_info = []
         
-        for edge in self.graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
+        for u, v, relation in self.graph.edges(data='relation', default='related'):
+            x0, y0 = pos[u]
+            x1, y1 = pos[v]
             edge_x.extend([x0, x1, None])
             edge_y.extend([y0, y1, None])
             
-            edge_data = self.graph.edges[edge]
-            edge_info.append(f"Relation: {edge_data.get('relation', 'related')}")
+            edge_info.append(f"Relation: {relation}")
         
         # Create edge trace
         edge_trace = go.Scatter(
@@ -391,12 +404,11 @@ class PatientKGVisualizer:
         node_colors = []
         node_sizes = []
         
-        for node in self.graph.nodes():
+        for node, node_data in self.graph.nodes(data=True):
             x, y = pos[node]
             node_x.append(x)
             node_y.append(y)
             
-            node_data = self.graph.nodes[node]
             node_text.append(self.node_labels.get(node, node))
             node_hover.append(f"<b>{node}</b><br>" + 
                             "<br>".join([f"{k}: {v}" for k, v in node_data.items() if k != 'type']))
@@ -483,21 +495,14 @@ class PatientKGVisualizer:
         print(f"   Total edges: {self.graph.number_of_edges()}")
         
         # Node type breakdown
-        node_types = {}
-        for node in self.graph.nodes():
-            node_type = self.graph.nodes[node].get('type', 'unknown')
-            node_types[node_type] = node_types.get(node_type, 0) + 1
+        node_types = Counter(node_type for _, node_type in self.graph.nodes(data='type', default='unknown'))
         
         print(f"\n📈 Node Types:")
         for node_type, count in sorted(node_types.items()):
             print(f"   {node_type}: {count}")
         
         # Edge type breakdown
-        edge_types = {}
-        for edge in self.graph.edges():
-            edge_data = self.graph.edges[edge]
-            edge_type = edge_data.get('relation', 'unknown')
-            edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
+        edge_types = Counter(edge_type for _, _, edge_type in self.graph.edges(data='relation', default='unknown'))
         
         print(f"\n🔗 Edge Types:")
         for edge_type, count in sorted(edge_types.items()):
@@ -14,6 +14,8 @@ import sys
 import os
 import re
 import math
+from functools import lru_cache
+from types import CodeType
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import networkx as nx
@@ -23,6 +25,43 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+# SQL -> Python rewrites applied by evaluate_condition, fused into one pattern
+# so each rule is scanned once. IN is matched case-insensitively; rules are
+# ASCII SQL, so \b uses the ASCII word table.
+_SQL_REWRITES = {
+    ' = TRUE': ' == True',
+    ' = FALSE': ' == False',
+    'TRUE': 'True',
+    'FALSE': 'False',
+    'AND': 'and',
+    'OR': 'or',
+}
+_SQL_REWRITE_RE = re.compile(
+    r' = TRUE| = FALSE|\b(?:TRUE|FALSE|AND|OR)\b|\b(?P<in>(?i:IN))\b',
+    re.ASCII,
+)
+
+
+def _rewrite_sql_token(match: re.Match) -> str:
+    """Return the Python replacement for a matched SQL token."""
+    if match.lastgroup == 'in':
+        return 'in'
+    return _SQL_REWRITES[match.group()]
+
+
+@lru_cache(maxsize=None)
+def compile_rule(rule: str) -> CodeType:
+    """Translate a SQL rule into a Python expression and compile it once per rule text."""
+    # In one pass: SQL IN ('a','b') -> Python in ('a','b'),
+    # "= TRUE/FALSE" -> "== True/False", AND/OR -> and/or
+    eval_cond = _SQL_REWRITE_RE.sub(_rewrite_sql_token, rule.strip())
+    return compile(eval_cond, '<policy rule>', 'eval')
+
+
+# Whitespace stripped from rules before matching them to descriptions
+_RULE_WHITESPACE_TABLE = str.maketrans('', '', ' \n\t')
+
+
 @dataclass
 class PolicyCondition:
     """Represents a single condition from SQL."""
@@ -52,6 +91,12 @@ class PatientRuleKGVisualizer:
         self.conditions: List[PolicyCondition] = []
         self.graph = nx.DiGraph()
         
+        # Evaluation context with patient values under original and lowercased keys
+        self.eval_context = {}
+        for key, value in patient_data.items():
+            self.eval_context[key] = value
+            self.eval_context[key.lower()] = value
+        
         # Build mapping from SQL rules to descriptions
         self.rule_to_description = {}
         for policy in policy_data:
@@ -62,7 +107,7 @@ class PatientRuleKGVisualizer:
                     logic = restriction.get('logic', 'AND')
                     if rule:
                         # Normalize for matching
-                        normalized = rule.lower().replace(' ', '').replace('\n', '')
+                        normalized = self.normalize_rule(rule)
                         self.rule_to_description[normalized] = {
                             'description': condition_desc,
                             'logic': logic
@@ -80,7 +125,7 @@ class PatientRuleKGVisualizer:
     
     def normalize_rule(self, rule: str) -> str:
         """Normalize a rule for matching."""
-        return rule.lower().replace(' ', '').replace('\n', '').replace('\t', '')
+        return rule.lower().translate(_RULE_WHITESPACE_TABLE)
     
     def parse_and_evaluate_conditions(self) -> None:
         """Parse policy conditions and evaluate them using policy rules."""
@@ -109,39 +154,26 @@ class PatientRuleKGVisualizer:
     def evaluate_condition(self, condition: str) -> bool:
         """Evaluate a SQL condition against patient data."""
         try:
-            # Build context with patient values
-            context = {}
-            for key, value in self.patient_data.items():
-                context[key] = value
-                context[key.lower()] = value
-            
-            # Prepare condition for evaluation
-            eval_cond = condition.strip()
-            
-            # Handle IN clauses: convert SQL IN ('a','b') to Python in ('a','b')
-            # This is already valid Python syntax, just need to replace IN with in
-            eval_cond = re.sub(r'\bIN\b', 'in', eval_cond, flags=re.IGNORECASE)
-            
-            # Handle boolean comparisons
-            eval_cond = eval_cond.replace(' = TRUE', ' == True')
-            eval_cond = eval_cond.replace(' = FALSE', ' == False')
-            eval_cond = re.sub(r'\bTRUE\b', 'True', eval_cond)
-            eval_cond = re.sub(r'\bFALSE\b', 'False', eval_cond)
-            
-            # Handle logical operators
-            eval_cond = re.sub(r'\bAND\b', 'and', eval_cond)
-            eval_cond = re.sub(r'\bOR\b', 'or', eval_cond)
-            
-            # Evaluate
-            result = eval(eval_cond, {"__builtins__": {}}, context)
+            code = compile_rule(condition)
+            result = eval(code, {"__builtins__": {}}, self.eval_context)
             return bool(result)
         except Exception as e:
             return False
     
+    def split_conditions_by_logic(self) -> Tuple[List[PolicyCondition], List[PolicyCondition]]:
+        """Partition conditions into AND and OR lists in a single pass."""
+        and_conditions = []
+        or_conditions = []
+        for condition in self.conditions:
+            if condition.logic == 'AND':
+                and_conditions.append(condition)
+            elif condition.logic == 'OR':
+                or_conditions.append(condition)
+        return and_conditions, or_conditions
+    
     def apply_logical_operators(self) -> None:
         """Apply OR/AND logic to conditions."""
-        and_conditions = [c for c in self.conditions if c.logic == 'AND']
-        or_conditions = [c for c in self.conditions if c.logic == 'OR']
+        and_conditions, or_conditions = self.split_conditions_by_logic()
         
         # Check if any OR condition is met
         has_met_or = any(c.is_met for c in or_conditions) if or_conditions else False
@@ -163,8 +195,7 @@ class PatientRuleKGVisualizer:
     
     def evaluate_policy_compliance(self) -> bool:
         """Evaluate if patient meets overall policy."""
-        and_conditions = [c for c in self.conditions if c.logic == 'AND']
-        or_conditions = [c for c in self.conditions if c.logic == 'OR']
+        and_conditions, or_conditions = self.split_conditions_by_logic()
         
         and_satisfied = all(c.is_met for c in and_conditions) if and_conditions else True
         or_satisfied = any(c.is_met for c in or_conditions) if or_conditions else True
@@ -176,16 +207,15 @@ class PatientRuleKGVisualizer:
         patient_id = self.patient_data.get('patient_id', 'unknown')
         patient_name = f"Patient {patient_id}"
         
-        self.graph.add_node(
-            patient_id,
-            type="Patient",
-            label=patient_name,
-            node_size=2000
-        )
+        nodes_to_add = [(patient_id, {
+            "type": "Patient",
+            "label": patient_name,
+            "node_size": 2000
+        })]
+        edges_to_add = []
         
         # Group by logic type
-        and_conditions = [c for c in self.conditions if c.logic == 'AND']
-        or_conditions = [c for c in self.conditions if c.logic == 'OR']
+        and_conditions, or_conditions = self.split_conditions_by_logic()
         
         condition_groups = {}
         if and_conditions:
@@ -199,18 +229,16 @@ class PatientRuleKGVisualizer:
         for i, (logic_type, conditions) in enumerate(condition_groups.items()):
             group_id = f"group_{logic_type}"
             
-            self.graph.add_node(
-                group_id,
-                type="ConditionGroup",
-                label=f"{logic_type} Conditions",
-                node_size=1500
-            )
+            nodes_to_add.append((group_id, {
+                "type": "ConditionGroup",
+                "label": f"{logic_type} Conditions",
+                "node_size": 1500
+            }))
             
-            self.graph.add_edge(
-                patient_id, group_id,
-                relation="evaluated_by",
-                edge_type="patient_group"
-            )
+            edges_to_add.append((patient_id, group_id, {
+                "relation": "evaluated_by",
+                "edge_type": "patient_group"
+            }))
             
             # Create condition nodes
             for j, condition in enumerate(conditions):
@@ -220,29 +248,30 @@ class PatientRuleKGVisualizer:
                 status = "✓" if condition.is_met else "✗"
                 label = f"{status} {label}"
                 
-                self.graph.add_node(
-                    condition_id,
-                    type="Condition",
-                    label=label,
-                    description=condition.condition,
-                    logic=condition.logic,
-                    is_met=condition.is_met,
-                    logical_status=condition.logical_status,
-                    node_size=1000
-                )
+                nodes_to_add.append((condition_id, {
+                    "type": "Condition",
+                    "label": label,
+                    "description": condition.condition,
+                    "logic": condition.logic,
+                    "is_met": condition.is_met,
+                    "logical_status": condition.logical_status,
+                    "node_size": 1000
+                }))
                 
-                self.graph.add_edge(
-                    group_id, condition_id,
-                    relation="contains",
-                    edge_type="group_condition"
-                )
+                edges_to_add.append((group_id, condition_id, {
+                    "relation": "contains",
+                    "edge_type": "group_condition"
+                }))
                 
                 edge_relation = condition.logical_status
-                self.graph.add_edge(
-                    patient_id, condition_id,
-                    relation=edge_relation,
-                    edge_type="patient_condition"
-                )
+                edges_to_add.append((patient_id, condition_id, {
+                    "relation": edge_relation,
+                    "edge_type": "patient_condition"
+                }))
+        
+        # Add everything in one pass, preserving insertion order
+        self.graph.add_nodes_from(nodes_to_add)
+        self.graph.add_edges_from(edges_to_add)
     
     def create_visualization(self, figsize: Tuple[int, int] = (16, 12),
                             output_file: Optional[str] = None,
@@ -253,8 +282,7 @@ class PatientRuleKGVisualizer:
         pos = nx.spring_layout(self.graph, k=3, iterations=50, seed=42)
         
         # Draw nodes
-        for node in self.graph.nodes():
-            node_data = self.graph.nodes[node]
+        for node, node_data in self.graph.nodes(data=True):
             node_type = node_data.get('type', 'Condition')
             
             if node_type == 'Patient':
@@ -290,10 +318,8 @@ class PatientRuleKGVisualizer:
         not_met_edges = []
         other_edges = []
         
-        for edge in self.graph.edges():
-            edge_data = self.graph.edges[edge]
-            relation = edge_data.get('relation', '')
-            
+        for u, v, relation in self.graph.edges(data='relation', default=''):
+            edge = (u, v)
             if relation == 'met':
                 met_edges.append(edge)
             elif relation == 'logically_met_by_other_or':